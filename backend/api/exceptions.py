@@ -9,6 +9,9 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+_400 = status.HTTP_400_BAD_REQUEST
+_500 = status.HTTP_500_INTERNAL_SERVER_ERROR
+
 
 def custom_exception_handler(exc, context):
     """
@@ -16,55 +19,50 @@ def custom_exception_handler(exc, context):
     """
     # Call REST framework's default exception handler first
     response = exception_handler(exc, context)
-    
-    # If response is None, it means Django raised an exception
-    # that DRF doesn't handle (like 400 Bad Request from Django itself)
-    if response is None:
-        # Check if it's a Django validation error
-        if hasattr(exc, 'message_dict'):
-            return Response(
-                {
-                    'error': 'Validation error',
-                    'details': exc.message_dict,
-                },
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        elif hasattr(exc, 'message'):
-            return Response(
-                {
-                    'error': str(exc),
-                    'details': exc.message if hasattr(exc, 'message') else str(exc),
-                },
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        else:
-            # Generic error handler
-            logger.error(f"Unhandled exception: {type(exc).__name__}: {exc}", exc_info=True)
-            return Response(
-                {
-                    'error': 'An error occurred',
-                    'details': str(exc) if str(exc) else f'{type(exc).__name__} occurred',
-                },
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
-    
-    # Customize the response data
-    custom_response_data = {
-        'error': 'An error occurred',
-        'details': str(exc),
-    }
-    
-    # If response already has data, use it
-    if hasattr(response, 'data') and response.data:
-        if isinstance(response.data, dict):
-            custom_response_data = response.data
-        else:
-            custom_response_data['details'] = response.data
-    
-    response.data = custom_response_data
-    
-    return response
 
+    # Common case: DRF produced a response. Dict payloads pass through
+    # untouched; only non-dict data gets wrapped. No str(exc) or dict
+    # allocation happens on this path.
+    if response is not None:
+        if isinstance(response.data, dict):
+            return response
+        response.data = {
+            'error': 'An error occurred',
+            'details': response.data,
+        }
+        return response
 
+    # Django raised something DRF doesn't handle (e.g. its own
+    # ValidationError); translate to JSON.
+    message_dict = getattr(exc, 'message_dict', None)
+    if message_dict is not None:
+        return Response(
+            {
+                'error': 'Validation error',
+                'details': message_dict,
+            },
+            status=_400
+        )
 
+    message = getattr(exc, 'message', None)
+    if message is not None:
+        return Response(
+            {
+                'error': str(exc),
+                'details': message,
+            },
+            status=_400
+        )
 
+    # Generic error handler. Lazy %-formatting plus the isEnabledFor guard
+    # keeps string/traceback building out of the picture when ERROR is
+    # filtered (e.g. a bad deploy flooding 500s).
+    if logger.isEnabledFor(logging.ERROR):
+        logger.error("Unhandled exception: %s: %s", type(exc).__name__, exc, exc_info=True)
+    return Response(
+        {
+            'error': 'An error occurred',
+            'details': str(exc) if str(exc) else f'{type(exc).__name__} occurred',
+        },
+        status=_500
+    )
@@ -0,0 +1,23 @@
+"""
+orjson-based renderer for Django REST Framework
+
+Replaces the stdlib-json renderer on the float-heavy list responses from
+the upload and prediction endpoints; serialization of float arrays and
+datetimes happens in compiled code.
+"""
+import orjson
+from rest_framework.renderers import BaseRenderer
+
+
+class ORJSONRenderer(BaseRenderer):
+    media_type = 'application/json'
+    format = 'json'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return orjson.dumps(
+            data,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC,
+        )
@@ -1,57 +1,127 @@
 """
 API Serializers
+
+DRF-compatible serializers backed by pydantic v2 models. Validation runs
+in pydantic-core (compiled) instead of DRF's per-field Python loop, which
+dominates CPU on the bulk upload endpoints.
 """
+from datetime import datetime
+from typing import Literal, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict, Field
+from pydantic import ValidationError as PydanticValidationError
 from rest_framework import serializers
 
 
-class WeatherDataSerializer(serializers.Serializer):
-    timestamp = serializers.DateTimeField()
-    temperature = serializers.FloatField(required=False)
-    humidity = serializers.FloatField(required=False)
-    wind_speed = serializers.FloatField(required=False)
-    cloud_cover = serializers.FloatField(required=False)
-    solar_irradiance = serializers.FloatField(required=False)
-    precipitation = serializers.FloatField(required=False)
-    is_forecast = serializers.BooleanField(default=False)
-    location = serializers.CharField(required=False, max_length=100)
+class WeatherDataModel(BaseModel):
+    model_config = ConfigDict(extra='ignore')
+
+    timestamp: datetime
+    temperature: Optional[float] = None
+    humidity: Optional[float] = None
+    wind_speed: Optional[float] = None
+    cloud_cover: Optional[float] = None
+    solar_irradiance: Optional[float] = None
+    precipitation: Optional[float] = None
+    is_forecast: bool = False
+    location: Optional[str] = Field(None, max_length=100)
+
+
+class ProductionDataModel(BaseModel):
+    model_config = ConfigDict(extra='ignore')
+
+    timestamp: datetime
+    energy_output_kwh: float
+    panel_id: Optional[str] = Field(None, max_length=50)
+    system_capacity_kw: Optional[float] = None
+    efficiency: Optional[float] = None
+
+
+class PredictionModel(BaseModel):
+    # protected_namespaces=(): the model_version field is ours, not part
+    # of pydantic's model_* namespace; without this every process start
+    # emits a UserWarning
+    model_config = ConfigDict(extra='ignore', protected_namespaces=())
+
+    prediction_type: Literal['hourly', 'daily']
+    timestamp: datetime
+    predicted_output_kwh: float
+    confidence_score: Optional[float] = None
+    model_version: Optional[str] = None
+    weather_data_id: Optional[UUID] = None
+    actual_output_kwh: Optional[float] = None
+
+
+class ImageUploadModel(BaseModel):
+    model_config = ConfigDict(extra='ignore')
+
+    filename: str
+    file_path: str
+    panel_id: Optional[str] = None
+    condition_score: Optional[float] = None
+    condition_status: Optional[Literal['excellent', 'good', 'fair', 'poor']] = None
+
+
+class TrainingJobModel(BaseModel):
+    # model_type is ours, not pydantic's model_* namespace (see above)
+    model_config = ConfigDict(extra='ignore', protected_namespaces=())
+
+    status: Literal['pending', 'running', 'completed', 'failed']
+    model_type: str
+    training_data_count: Optional[int] = None
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    error_message: Optional[str] = None
+
+
+class CoordsModel(BaseModel):
+    lat: float = Field(ge=-90, le=90)
+    lon: float = Field(ge=-180, le=180)
+
+
+class PydanticSerializer(serializers.BaseSerializer):
+    """
+    Thin DRF adapter delegating field validation to a pydantic model.
+
+    Subclasses set `pydantic_model`; is_valid()/validated_data keep their
+    DRF semantics while the per-field work happens in a single compiled
+    model_validate call.
+    """
+    pydantic_model = None
+
+    def to_internal_value(self, data):
+        try:
+            model = self.pydantic_model.model_validate(data)
+        except PydanticValidationError as exc:
+            raise serializers.ValidationError(exc.errors())
+        return model.model_dump(exclude_unset=True)
+
+    def to_representation(self, instance):
+        if isinstance(instance, BaseModel):
+            return instance.model_dump()
+        return self.pydantic_model.model_validate(instance).model_dump()
+
 
+class WeatherDataSerializer(PydanticSerializer):
+    pydantic_model = WeatherDataModel
 
-class ProductionDataSerializer(serializers.Serializer):
-    timestamp = serializers.DateTimeField()
-    energy_output_kwh = serializers.FloatField()
-    panel_id = serializers.CharField(required=False, max_length=50)
-    system_capacity_kw = serializers.FloatField(required=False)
-    efficiency = serializers.FloatField(required=False)
 
+class ProductionDataSerializer(PydanticSerializer):
+    pydantic_model = ProductionDataModel
 
-class PredictionSerializer(serializers.Serializer):
-    prediction_type = serializers.ChoiceField(choices=['hourly', 'daily'])
-    timestamp = serializers.DateTimeField()
-    predicted_output_kwh = serializers.FloatField()
-    confidence_score = serializers.FloatField(required=False)
-    model_version = serializers.CharField(required=False)
-    weather_data_id = serializers.UUIDField(required=False)
-    actual_output_kwh = serializers.FloatField(required=False)
 
+class PredictionSerializer(PydanticSerializer):
+    pydantic_model = PredictionModel
 
-class ImageUploadSerializer(serializers.Serializer):
-    filename = serializers.CharField()
-    file_path = serializers.CharField()
-    panel_id = serializers.CharField(required=False)
-    condition_score = serializers.FloatField(required=False)
-    condition_status = serializers.ChoiceField(
-        choices=['excellent', 'good', 'fair', 'poor'],
-        required=False
-    )
 
+class ImageUploadSerializer(PydanticSerializer):
+    pydantic_model = ImageUploadModel
 
-class TrainingJobSerializer(serializers.Serializer):
-    status = serializers.ChoiceField(choices=['pending', 'running', 'completed', 'failed'])
-    model_type = serializers.CharField()
-    training_data_count = serializers.IntegerField(required=False)
-    started_at = serializers.DateTimeField(required=False)
-    completed_at = serializers.DateTimeField(required=False)
-    error_message = serializers.CharField(required=False)
 
+class TrainingJobSerializer(PydanticSerializer):
+    pydantic_model = TrainingJobModel
 
 
+class CoordsSerializer(PydanticSerializer):
+    pydantic_model = CoordsModel
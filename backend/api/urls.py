@@ -1,7 +1,10 @@
 """
 API URL Configuration
 """
+from django.http import JsonResponse
 from django.urls import path, include
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition, require_GET
 from rest_framework.routers import DefaultRouter
 from . import views
 
@@ -13,14 +16,33 @@ router.register(r'predictions', views.PredictionViewSet, basename='predictions')
 router.register(r'training', views.TrainingViewSet, basename='training')
 router.register(r'health', views.HealthViewSet, basename='health')
 
+
+@require_GET
+@cache_control(max_age=60)
+def alive(request):
+    """Plain liveness probe, compiled once instead of a per-import lambda."""
+    return JsonResponse({'status': 'Django ALIVE', 'time': request.GET.urlencode()})
+
+
 urlpatterns = [
-    path('test', lambda request: JsonResponse({'status': 'Django ALIVE', 'time': request.GET})),
+    path('test', alive),
     path('', include(router.urls)),
-    path('dashboard/stats', views.DashboardStatsView.as_view(), name='dashboard-stats'),
+    # Read-mostly endpoints get an ETag fast path: repeat polls with a
+    # matching If-None-Match return 304 without re-running the view.
+    path(
+        'dashboard/stats',
+        condition(etag_func=views.dashboard_stats_etag)(views.DashboardStatsView.as_view()),
+        name='dashboard-stats',
+    ),
     path('auth/login', views.LoginView.as_view(), name='login'),
-    path('forecast/solar', views.SolarForecastProxy.as_view(), name='solar-forecast'),
-    path('geocode/search', views.GeocodeSearchProxy.as_view(), name='geocode-search'),
+    path(
+        'forecast/solar',
+        condition(etag_func=views.forecast_etag)(views.SolarForecastProxy.as_view()),
+        name='solar-forecast',
+    ),
+    path(
+        'geocode/search',
+        condition(etag_func=views.geocode_etag)(views.GeocodeSearchProxy.as_view()),
+        name='geocode-search',
+    ),
 ]
-
-
-
@@ -2,13 +2,16 @@
 File Handler - Processes uploaded CSV, XLSX, PDF and image files
 """
 import os
-import pandas as pd
 from datetime import datetime
 from django.conf import settings
 from PIL import Image
 import pdfplumber
 import io
 
+# pandas is imported lazily inside the parsing methods: api.views pulls
+# this module in at startup, and only the parse/clean paths need pandas,
+# so web workers skip its import cost entirely.
+
 
 class FileHandler:
     """
@@ -17,7 +20,7 @@ class FileHandler:
     """
     
     MAX_FILE_SIZE = getattr(settings, 'MAX_UPLOAD_SIZE', 20 * 1024 * 1024)  # 20MB
-    ALLOWED_EXTENSIONS = ['.csv', '.xlsx', '.xls', '.pdf']
+    ALLOWED_EXTENSIONS = ('.csv', '.xlsx', '.xls', '.pdf')
     
     def __init__(self):
         self.upload_dir = os.path.join(settings.MEDIA_ROOT, 'uploads')
@@ -33,9 +36,9 @@ class FileHandler:
         if hasattr(file, 'size') and file.size > self.MAX_FILE_SIZE:
             raise ValueError(f"File size exceeds maximum allowed size of {self.MAX_FILE_SIZE / (1024*1024):.0f}MB")
         
-        # Check file extension
+        # Check file extension (endswith takes the whole tuple in one C call)
         filename = file.name.lower()
-        if not any(filename.endswith(ext) for ext in self.ALLOWED_EXTENSIONS):
+        if not filename.endswith(self.ALLOWED_EXTENSIONS):
             raise ValueError(f"File type not supported. Allowed types: {', '.join(self.ALLOWED_EXTENSIONS)}")
         
         return True
@@ -44,6 +47,8 @@ class FileHandler:
         """
         Read file into pandas DataFrame based on file extension
         """
+        import pandas as pd
+
         filename = file.name.lower()
         
         # Reset file pointer
@@ -54,7 +59,13 @@ class FileHandler:
             if filename.endswith('.csv'):
                 df = pd.read_csv(file)
             elif filename.endswith(('.xlsx', '.xls')):
-                df = pd.read_excel(file, engine='openpyxl')
+                # calamine (Rust) parses XLSX several times faster than
+                # openpyxl; fall back when the engine is unavailable
+                try:
+                    df = pd.read_excel(file, engine='calamine')
+                except (ImportError, ValueError):
+                    file.seek(0)
+                    df = pd.read_excel(file, engine='openpyxl')
             elif filename.endswith('.pdf'):
                 # Extract tables from PDF
                 df = self._extract_pdf_tables(file)
@@ -69,27 +80,25 @@ class FileHandler:
         """
         Extract tables from PDF file using pdfplumber
         """
+        import pandas as pd
+
         try:
             # Reset file pointer
             file.seek(0)
             
-            # Read PDF
+            # Read PDF, tracking the largest table inline so only one
+            # table is held at a time instead of every table from every
+            # page plus a second max() pass
             with pdfplumber.open(file) as pdf:
-                all_tables = []
-                
-                # Extract tables from each page
+                largest_table = None
                 for page in pdf.pages:
-                    tables = page.extract_tables()
-                    if tables:
-                        all_tables.extend(tables)
+                    for table in page.extract_tables() or ():
+                        if largest_table is None or len(table) > len(largest_table):
+                            largest_table = table
                 
-                if not all_tables:
+                if largest_table is None:
                     raise ValueError("No tables found in PDF. Please ensure the PDF contains tabular data.")
                 
-                # Use the first table (or merge all tables if needed)
-                # For now, we'll use the largest table
-                largest_table = max(all_tables, key=len)
-                
                 # Convert to DataFrame
                 if len(largest_table) > 1:
                     # First row as header
@@ -101,6 +110,142 @@ class FileHandler:
         except Exception as e:
             raise Exception(f"Error extracting PDF tables: {str(e)}. Please ensure the PDF contains readable tabular data.")
     
+    # Rows parsed per chunk when streaming CSVs; matches the insert batch
+    # size used by the ingestion tasks.
+    CSV_CHUNK_SIZE = 1000
+
+    # Push column selection into pandas' C parser: unknown columns are
+    # dropped at parse time instead of being materialized and discarded
+    # later. Numeric dtypes are deliberately NOT forced here - a stray
+    # non-numeric cell (e.g. "N/A") would abort the whole parse, where
+    # ingestion has always coerced it to NaN and filled it. Clean numeric
+    # columns still come out float-typed from inference, so the cleaners'
+    # to_numeric pass only runs for columns that actually need coercing.
+    WEATHER_CSV_KWARGS = {
+        'usecols': lambda col: col in {
+            'timestamp', 'temperature', 'humidity', 'wind_speed',
+            'cloud_cover', 'solar_irradiance', 'precipitation',
+            'is_forecast', 'location',
+        },
+    }
+    PRODUCTION_CSV_KWARGS = {
+        'usecols': lambda col: col in {
+            'timestamp', 'energy_output_kwh', 'panel_id',
+            'system_capacity_kw', 'efficiency',
+        },
+    }
+
+    def _clean_weather_frame(self, df):
+        """
+        Validate and normalize a weather DataFrame, returning Supabase rows.
+        """
+        import pandas as pd
+
+        # Validate required columns
+        required_cols = ['timestamp']
+        if not all(col in df.columns for col in required_cols):
+            raise ValueError(f"File must contain columns: {', '.join(required_cols)}. Found columns: {', '.join(df.columns.tolist())}")
+
+        # Convert timestamp to ISO format
+        df['timestamp'] = pd.to_datetime(df['timestamp'], errors='coerce')
+        if df['timestamp'].isna().any():
+            raise ValueError("Invalid timestamp format. Please ensure timestamps are in a recognizable date/time format.")
+        df['timestamp'] = df['timestamp'].dt.strftime('%Y-%m-%dT%H:%M:%S')
+
+        # Fill missing values (clean CSV columns are already float-typed
+        # by parser inference; to_numeric only coerces object columns)
+        numeric_cols = ['temperature', 'humidity', 'wind_speed', 'cloud_cover',
+                      'solar_irradiance', 'precipitation']
+        present = [col for col in numeric_cols if col in df.columns]
+        for col in present:
+            if not pd.api.types.is_float_dtype(df[col]):
+                df[col] = pd.to_numeric(df[col], errors='coerce')
+        if present:
+            df[present] = df[present].fillna(0)
+
+        # Convert to dict format for Supabase, dropping NaN values
+        return [
+            {k: v for k, v in record.items() if pd.notna(v)}
+            for record in df.to_dict('records')
+        ]
+
+    def _clean_production_frame(self, df):
+        """
+        Validate and normalize a production DataFrame, returning Supabase rows.
+        """
+        import pandas as pd
+
+        # Validate required columns
+        if 'timestamp' not in df.columns or 'energy_output_kwh' not in df.columns:
+            raise ValueError(f"File must contain 'timestamp' and 'energy_output_kwh' columns. Found columns: {', '.join(df.columns.tolist())}")
+
+        # Convert timestamp
+        df['timestamp'] = pd.to_datetime(df['timestamp'], errors='coerce')
+        if df['timestamp'].isna().any():
+            raise ValueError("Invalid timestamp format. Please ensure timestamps are in a recognizable date/time format.")
+        df['timestamp'] = df['timestamp'].dt.strftime('%Y-%m-%dT%H:%M:%S')
+
+        # Validate energy output
+        df['energy_output_kwh'] = pd.to_numeric(df['energy_output_kwh'], errors='coerce')
+        if df['energy_output_kwh'].isna().any():
+            raise ValueError("energy_output_kwh must be numeric")
+
+        # Fill optional columns
+        if 'system_capacity_kw' in df.columns:
+            df['system_capacity_kw'] = pd.to_numeric(df['system_capacity_kw'], errors='coerce')
+        if 'efficiency' in df.columns:
+            df['efficiency'] = pd.to_numeric(df['efficiency'], errors='coerce')
+
+        # Convert to dict format, dropping NaN values
+        return [
+            {k: v for k, v in record.items() if pd.notna(v)}
+            for record in df.to_dict('records')
+        ]
+
+    def _iter_frames(self, file, csv_kwargs=None):
+        """
+        Yield DataFrames from the file, streaming CSVs in chunks.
+
+        CSV files are parsed CSV_CHUNK_SIZE rows at a time so a 20MB
+        upload never materializes as one giant frame plus one giant
+        record list. XLSX and PDF parsers have no incremental mode, so
+        those come through as a single frame.
+        """
+        import pandas as pd
+
+        filename = file.name.lower()
+
+        # Reset file pointer
+        if hasattr(file, 'seek'):
+            file.seek(0)
+
+        if filename.endswith('.csv'):
+            yield from pd.read_csv(file, chunksize=self.CSV_CHUNK_SIZE, **(csv_kwargs or {}))
+        else:
+            yield self._read_dataframe(file)
+
+    def iter_weather_records(self, file):
+        """
+        Stream cleaned weather rows from the file, one batch per chunk.
+        """
+        try:
+            self._validate_file(file)
+            for df in self._iter_frames(file, self.WEATHER_CSV_KWARGS):
+                yield self._clean_weather_frame(df)
+        except Exception as e:
+            raise Exception(f"Error processing weather file: {str(e)}")
+
+    def iter_production_records(self, file):
+        """
+        Stream cleaned production rows from the file, one batch per chunk.
+        """
+        try:
+            self._validate_file(file)
+            for df in self._iter_frames(file, self.PRODUCTION_CSV_KWARGS):
+                yield self._clean_production_frame(df)
+        except Exception as e:
+            raise Exception(f"Error processing production file: {str(e)}")
+
     def process_weather_csv(self, file):
         """
         Process weather data file (CSV, XLSX, or PDF)
@@ -114,32 +259,7 @@ class FileHandler:
             # Read file into DataFrame
             df = self._read_dataframe(file)
             
-            # Validate required columns
-            required_cols = ['timestamp']
-            if not all(col in df.columns for col in required_cols):
-                raise ValueError(f"File must contain columns: {', '.join(required_cols)}. Found columns: {', '.join(df.columns.tolist())}")
-            
-            # Convert timestamp to ISO format
-            df['timestamp'] = pd.to_datetime(df['timestamp'], errors='coerce')
-            if df['timestamp'].isna().any():
-                raise ValueError("Invalid timestamp format. Please ensure timestamps are in a recognizable date/time format.")
-            df['timestamp'] = df['timestamp'].dt.strftime('%Y-%m-%dT%H:%M:%S')
-            
-            # Fill missing values
-            numeric_cols = ['temperature', 'humidity', 'wind_speed', 'cloud_cover', 
-                          'solar_irradiance', 'precipitation']
-            for col in numeric_cols:
-                if col in df.columns:
-                    df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
-            
-            # Convert to dict format for Supabase
-            records = df.to_dict('records')
-            
-            # Clean up None values
-            for record in records:
-                record = {k: v for k, v in record.items() if pd.notna(v)}
-            
-            return records
+            return self._clean_weather_frame(df)
             
         except Exception as e:
             raise Exception(f"Error processing weather file: {str(e)}")
@@ -157,35 +277,7 @@ class FileHandler:
             # Read file into DataFrame
             df = self._read_dataframe(file)
             
-            # Validate required columns
-            if 'timestamp' not in df.columns or 'energy_output_kwh' not in df.columns:
-                raise ValueError(f"File must contain 'timestamp' and 'energy_output_kwh' columns. Found columns: {', '.join(df.columns.tolist())}")
-            
-            # Convert timestamp
-            df['timestamp'] = pd.to_datetime(df['timestamp'], errors='coerce')
-            if df['timestamp'].isna().any():
-                raise ValueError("Invalid timestamp format. Please ensure timestamps are in a recognizable date/time format.")
-            df['timestamp'] = df['timestamp'].dt.strftime('%Y-%m-%dT%H:%M:%S')
-            
-            # Validate energy output
-            df['energy_output_kwh'] = pd.to_numeric(df['energy_output_kwh'], errors='coerce')
-            if df['energy_output_kwh'].isna().any():
-                raise ValueError("energy_output_kwh must be numeric")
-            
-            # Fill optional columns
-            if 'system_capacity_kw' in df.columns:
-                df['system_capacity_kw'] = pd.to_numeric(df['system_capacity_kw'], errors='coerce')
-            if 'efficiency' in df.columns:
-                df['efficiency'] = pd.to_numeric(df['efficiency'], errors='coerce')
-            
-            # Convert to dict format
-            records = df.to_dict('records')
-            
-            # Clean up None values
-            for record in records:
-                record = {k: v for k, v in record.items() if pd.notna(v)}
-            
-            return records
+            return self._clean_production_frame(df)
             
         except Exception as e:
             raise Exception(f"Error processing production file: {str(e)}")
@@ -195,21 +287,30 @@ class FileHandler:
         Save uploaded image file and return file path
         """
         try:
-            # Validate image
-            img = Image.open(file)
+            # Read the upload once into memory; verification and both save
+            # paths reuse the buffer, so there is a single header parse and
+            # no second read of the upload stream
+            buf = io.BytesIO(file.read())
+            img = Image.open(buf)
             img.verify()
-            
-            # Reset file pointer
-            file.seek(0)
+            img_format = img.format
             
             # Generate filename
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             filename = f"{timestamp}_{file.name}"
             file_path = os.path.join(self.image_dir, filename)
             
-            # Save image
-            img = Image.open(file)
-            img.save(file_path)
+            # If the upload is already in the format its extension claims,
+            # write the bytes straight to disk: no decode, no re-encode,
+            # no recompression loss. Only fall back to PIL when the bytes
+            # need converting to match the extension.
+            ext = os.path.splitext(file.name)[1].lower()
+            if img_format and Image.registered_extensions().get(ext) == img_format:
+                with open(file_path, 'wb') as out:
+                    out.write(buf.getbuffer())
+            else:
+                buf.seek(0)
+                Image.open(buf).save(file_path)
             
             # Return relative path
             return os.path.join('images', filename)
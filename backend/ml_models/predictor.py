@@ -2,12 +2,89 @@
 Solar Energy Predictor - Loads trained models and generates predictions
 """
 import os
-import pickle
+import threading
+import time
+
+import joblib
 import numpy as np
-import pandas as pd
 from datetime import datetime, timedelta
 from django.conf import settings
-from supabase import create_client, Client
+from cachetools import TTLCache
+from api.authentication import get_supabase
+
+
+# Weather rows for a given timestamp change at forecast-refresh cadence,
+# so repeated prediction calls within a few minutes can reuse them. Only
+# timestamps that actually had data are cached; missing ones are retried
+# so newly ingested weather shows up immediately. The active-model row is
+# already fetched once per process via get_predictor().
+_weather_feature_cache = TTLCache(maxsize=1024, ttl=300)
+# TTLCache is not thread-safe; predictions can run concurrently on
+# request threads, so reads and writes go through this lock.
+_weather_feature_cache_lock = threading.Lock()
+
+
+# How often a process re-checks which model version is active. With a
+# real broker training runs in a separate Celery worker, so an in-process
+# cache clear never reaches the web workers; this bounds how long they
+# can serve a superseded model.
+_MODEL_CHECK_SECONDS = 60
+
+_predictor = None
+_predictor_checked_at = 0.0
+_predictor_lock = threading.Lock()
+
+
+def _active_model_version():
+    """Name of the active regression model (one narrow single-row select)."""
+    result = (
+        get_supabase().table('model_versions')
+        .select('version_name')
+        .eq('is_active', True).eq('model_type', 'regression')
+        .limit(1).execute()
+    )
+    return result.data[0]['version_name'] if result.data else None
+
+
+def get_predictor() -> 'SolarEnergyPredictor':
+    """
+    Return a process-wide predictor instance.
+
+    Constructing SolarEnergyPredictor unpickles the model and queries
+    Supabase for the active version; doing that per request is pure
+    overhead. Every _MODEL_CHECK_SECONDS the cached instance's version is
+    compared against the active row and the predictor is reloaded if a
+    training job has activated a new model in the meantime.
+    """
+    global _predictor, _predictor_checked_at
+    now = time.monotonic()
+    with _predictor_lock:
+        if _predictor is not None and now - _predictor_checked_at < _MODEL_CHECK_SECONDS:
+            return _predictor
+        if _predictor is None:
+            _predictor = SolarEnergyPredictor()
+        else:
+            try:
+                stale = _active_model_version() != _predictor.model_version
+            except Exception:
+                # Probe failed: keep serving the model we have
+                stale = False
+            if stale:
+                _predictor = SolarEnergyPredictor()
+        _predictor_checked_at = now
+        return _predictor
+
+
+def reset_predictor() -> None:
+    """
+    Drop this process's cached predictor so the next call reloads.
+
+    Called by the training task after activating a new model; other
+    processes pick the change up through the periodic staleness check.
+    """
+    global _predictor
+    with _predictor_lock:
+        _predictor = None
 
 
 class SolarEnergyPredictor:
@@ -24,16 +101,18 @@ class SolarEnergyPredictor:
     def _load_model(self):
         """Load the active ML model"""
         try:
-            supabase: Client = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
-            result = supabase.table('model_versions').select('*').eq('is_active', True).eq('model_type', 'regression').limit(1).execute()
+            supabase = get_supabase()
+            result = supabase.table('model_versions').select('version_name,file_path').eq('is_active', True).eq('model_type', 'regression').limit(1).execute()
             
             if result.data:
                 model_info = result.data[0]
                 model_path = model_info['file_path']
                 
                 if os.path.exists(model_path):
-                    with open(model_path, 'rb') as f:
-                        self.model = pickle.load(f)
+                    # mmap the model's arrays: gunicorn workers share the
+                    # physical pages instead of each holding a full copy,
+                    # and cold loads demand-page instead of reading it all
+                    self.model = joblib.load(model_path, mmap_mode='r')
                     self.model_version = model_info['version_name']
                     self.model_loaded = True
                 else:
@@ -43,95 +122,103 @@ class SolarEnergyPredictor:
             # Use a simple default model for development
             self.model_loaded = False
     
-    def _get_weather_features(self, timestamp):
+    # Feature order expected by the trained model, with the default used
+    # when no weather row exists for a timestamp (average conditions)
+    FEATURE_DEFAULTS = (
+        ('temperature', 20.0),
+        ('humidity', 50.0),
+        ('wind_speed', 5.0),
+        ('cloud_cover', 30.0),
+        ('solar_irradiance', 500.0),
+        ('precipitation', 0.0),
+    )
+    # Column projection for the batched lookup: only the feature columns
+    # (plus the timestamp key) cross the wire, not every stored column
+    FEATURE_SELECT = 'timestamp,' + ','.join(name for name, _ in FEATURE_DEFAULTS)
+
+    def _get_weather_features_batch(self, iso_timestamps):
         """
-        Get weather features for a given timestamp
-        Returns default values if no weather data available
+        Get feature rows for all timestamps in one Supabase query.
+
+        One in_() filter replaces the previous per-timestamp SELECT (the
+        classic N+1); timestamps without weather data fall back to the
+        default average conditions.
         """
-        try:
-            supabase: Client = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
-            result = supabase.table('weather_data').select('*').eq('timestamp', timestamp.isoformat()).limit(1).execute()
-            
-            if result.data and len(result.data) > 0:
-                weather = result.data[0]
-                return [
-                    weather.get('temperature', 20.0),
-                    weather.get('humidity', 50.0),
-                    weather.get('wind_speed', 5.0),
-                    weather.get('cloud_cover', 30.0),
-                    weather.get('solar_irradiance', 500.0),
-                    weather.get('precipitation', 0.0),
-                ]
-        except Exception as e:
-            print(f"Error fetching weather data: {str(e)}")
+        features_by_ts = {}
+        missing = []
+        with _weather_feature_cache_lock:
+            for ts in iso_timestamps:
+                cached = _weather_feature_cache.get(ts)
+                if cached is not None:
+                    features_by_ts[ts] = cached
+                else:
+                    missing.append(ts)
+        
+        if missing:
+            try:
+                supabase = get_supabase()
+                result = supabase.table('weather_data').select(self.FEATURE_SELECT).in_('timestamp', missing).execute()
+                with _weather_feature_cache_lock:
+                    for row in (result.data or []):
+                        features = [row.get(name, default) for name, default in self.FEATURE_DEFAULTS]
+                        features_by_ts[row['timestamp']] = features
+                        _weather_feature_cache[row['timestamp']] = features
+            except Exception as e:
+                print(f"Error fetching weather data: {str(e)}")
         
-        # Default features (average conditions)
-        return [20.0, 50.0, 5.0, 30.0, 500.0, 0.0]
+        defaults = [default for _, default in self.FEATURE_DEFAULTS]
+        return [features_by_ts.get(ts, defaults) for ts in iso_timestamps]
     
-    def predict_hourly(self, hours=24):
+    def _predict_batch(self, timestamps, scale=1.0):
         """
-        Generate hourly predictions for the next N hours
+        Run one batched weather lookup and one model.predict call for all
+        timestamps, then assemble the response rows.
         """
-        predictions = []
-        now = datetime.now()
+        iso_timestamps = [t.isoformat() for t in timestamps]
+        features = self._get_weather_features_batch(iso_timestamps)
+        # float32 halves memory traffic through the sklearn predict path;
+        # the trainer fits on float32 so no dtype conversion happens inside
+        X = np.asarray(features, dtype=np.float32)
         
-        for i in range(hours):
-            timestamp = now + timedelta(hours=i)
-            features = self._get_weather_features(timestamp)
-            
-            if self.model_loaded and self.model:
-                # Use trained model
-                prediction = self.model.predict([features])[0]
-            else:
-                # Simple heuristic: solar_irradiance * 0.5 (kW conversion factor)
-                prediction = max(0, features[4] * 0.5)
-            
-            predictions.append({
-                'timestamp': timestamp.isoformat(),
-                'predicted_output_kwh': float(prediction),
-                'confidence_score': 0.85 if self.model_loaded else 0.5,
+        if self.model_loaded and self.model:
+            # Use trained model - one vectorized call instead of N
+            outputs = self.model.predict(X) * scale
+        else:
+            # Simple heuristic: solar_irradiance * 0.5 (kW conversion factor)
+            outputs = np.maximum(X[:, 4] * 0.5, 0) * scale
+        
+        confidence = 0.85 if self.model_loaded else 0.5
+        return [
+            {
+                'timestamp': iso,
+                'predicted_output_kwh': float(output),
+                'confidence_score': confidence,
                 'model_version': self.model_version,
                 'weather_features': {
-                    'temperature': features[0],
-                    'solar_irradiance': features[4],
-                    'cloud_cover': features[3],
+                    'temperature': row[0],
+                    'solar_irradiance': row[4],
+                    'cloud_cover': row[3],
                 }
-            })
-        
-        return predictions
+            }
+            for iso, row, output in zip(iso_timestamps, features, outputs)
+        ]
+    
+    def predict_hourly(self, hours=24):
+        """
+        Generate hourly predictions for the next N hours
+        """
+        now = datetime.now()
+        timestamps = [now + timedelta(hours=i) for i in range(hours)]
+        return self._predict_batch(timestamps)
     
     def predict_daily(self, days=7):
         """
         Generate daily predictions for the next N days
         """
-        predictions = []
         now = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-        
-        for i in range(days):
-            date = now + timedelta(days=i)
-            # Get average weather for the day
-            features = self._get_weather_features(date)
-            
-            if self.model_loaded and self.model:
-                # Use trained model
-                daily_prediction = self.model.predict([features])[0] * 24  # Convert hourly to daily
-            else:
-                # Simple heuristic
-                daily_prediction = max(0, features[4] * 0.5 * 24)
-            
-            predictions.append({
-                'timestamp': date.isoformat(),
-                'predicted_output_kwh': float(daily_prediction),
-                'confidence_score': 0.85 if self.model_loaded else 0.5,
-                'model_version': self.model_version,
-                'weather_features': {
-                    'temperature': features[0],
-                    'solar_irradiance': features[4],
-                    'cloud_cover': features[3],
-                }
-            })
-        
-        return predictions
+        timestamps = [now + timedelta(days=i) for i in range(days)]
+        # Convert hourly model output to daily totals
+        return self._predict_batch(timestamps, scale=24.0)
 
 
 
@@ -0,0 +1,44 @@
+"""
+Background tasks for model training
+
+Training a RandomForest over the full dataset takes far longer than a
+request should; this task runs it off the web thread and keeps the
+training_jobs row updated so clients can poll for progress. Without a
+broker the task runs eagerly, matching the old synchronous behavior.
+"""
+from datetime import datetime
+
+from celery import shared_task
+
+from api.authentication import get_supabase
+from .predictor import reset_predictor
+from .trainer import ModelTrainer
+
+
+@shared_task
+def run_training_job(job_id, model_type='regression'):
+    supabase = get_supabase()
+    supabase.table('training_jobs').update({
+        'status': 'running',
+        'started_at': datetime.now().isoformat(),
+    }).eq('id', job_id).execute()
+
+    try:
+        result = ModelTrainer().train_model(model_type=model_type)
+    except Exception as e:
+        supabase.table('training_jobs').update({
+            'status': 'failed',
+            'error_message': str(e),
+            'completed_at': datetime.now().isoformat(),
+        }).eq('id', job_id).execute()
+        raise
+
+    supabase.table('training_jobs').update({
+        'status': 'completed',
+        'training_data_count': result.get('training_samples'),
+        'completed_at': datetime.now().isoformat(),
+    }).eq('id', job_id).execute()
+    # Drop this process's cached predictor; web workers pick up the new
+    # model through get_predictor's periodic active-version check
+    reset_predictor()
+    return result
@@ -0,0 +1,14 @@
+"""
+ASGI config for solar_app project.
+
+Serves the app under Uvicorn/Daphne so I/O-bound endpoints are no longer
+pinned to one thread per request; views stay sync and Django dispatches
+them onto its thread pool.
+"""
+import os
+
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'solar_app.settings')
+
+application = get_asgi_application()
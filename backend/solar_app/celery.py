@@ -0,0 +1,16 @@
+"""
+Celery application for solar_app
+
+Heavy work (file ingestion, model training) runs here instead of on web
+request threads. Without a configured broker the tasks execute eagerly
+in-process, so development setups keep working with no extra services.
+"""
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'solar_app.settings')
+
+app = Celery('solar_app')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
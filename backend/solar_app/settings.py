@@ -84,6 +84,11 @@ DATABASES = {
 # Supabase Configuration
 SUPABASE_URL = os.getenv('SUPABASE_URL', '')
 SUPABASE_KEY = os.getenv('SUPABASE_KEY', '')
+# JWKS endpoint for offline JWT verification. Opt-in: projects still on
+# symmetric (HS256) access tokens have no matching key in the JWKS, so
+# online verification through the Supabase client stays the default.
+# Typically f"{SUPABASE_URL}/auth/v1/.well-known/jwks.json".
+SUPABASE_JWKS_URL = os.getenv('SUPABASE_JWKS_URL', '')
 
 # External API configuration
 SOLCAST_API_KEY = os.getenv('SOLCAST_API_KEY', '')
@@ -96,6 +101,31 @@ NOMINATIM_USER_AGENT = os.getenv('NOMINATIM_USER_AGENT', 'SolarForecastDashboard
 NOMINATIM_EMAIL = os.getenv('NOMINATIM_EMAIL', '')
 NOMINATIM_RATE_LIMIT_SECONDS = float(os.getenv('NOMINATIM_RATE_LIMIT_SECONDS', '1'))
 
+# Cache - shared Redis across workers when configured, per-process
+# in-memory fallback otherwise
+REDIS_URL = os.getenv('REDIS_URL', '')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'OPTIONS': {'MAX_ENTRIES': 4096},
+        }
+    }
+
+# Celery - background ingestion/training. Without a broker, tasks run
+# eagerly in-process so development needs no extra services.
+CELERY_BROKER_URL = os.getenv('CELERY_BROKER_URL', REDIS_URL)
+CELERY_RESULT_BACKEND = os.getenv('CELERY_RESULT_BACKEND', CELERY_BROKER_URL or None)
+CELERY_TASK_ALWAYS_EAGER = not CELERY_BROKER_URL
+CELERY_TASK_EAGER_PROPAGATES = True
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -134,6 +164,15 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'api.authentication.SupabaseJWTAuthentication',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'api.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
@@ -176,3 +176,53 @@ CREATE POLICY "Profiles are readable by authenticated users" ON profiles FOR SEL
 
 
 
+
+-- Server-side aggregate for the dashboard: sums production once in
+-- Postgres instead of shipping full rows to the API to add up in Python
+CREATE OR REPLACE FUNCTION total_production_kwh()
+RETURNS double precision
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT COALESCE(SUM(energy_output_kwh), 0) FROM production_data
+$$;
+
+
+-- Server-side training join: aligns weather and production rows on the
+-- hour in Postgres and returns only the columns the trainer consumes,
+-- replacing two full-table transfers plus a pandas merge
+CREATE OR REPLACE VIEW training_features_v AS
+SELECT
+    date_trunc('hour', w.timestamp) AS ts,
+    w.temperature,
+    w.humidity,
+    w.wind_speed,
+    w.cloud_cover,
+    w.solar_irradiance,
+    w.precipitation,
+    p.energy_output_kwh
+FROM weather_data w
+JOIN production_data p
+  ON date_trunc('hour', w.timestamp) = date_trunc('hour', p.timestamp);
+
+-- One-transaction model activation: deactivates the previous versions
+-- and registers the new one in a single round trip from the trainer
+CREATE OR REPLACE FUNCTION register_new_model(
+    p_version_name text,
+    p_model_type text,
+    p_file_path text,
+    p_accuracy_score double precision,
+    p_mse double precision
+)
+RETURNS void
+LANGUAGE sql
+AS $$
+    UPDATE model_versions SET is_active = false WHERE model_type = p_model_type;
+    INSERT INTO model_versions (
+        version_name, model_type, file_path, accuracy_score, mse,
+        is_active, training_data_start, training_data_end
+    ) VALUES (
+        p_version_name, p_model_type, p_file_path, p_accuracy_score, p_mse,
+        true, now(), now()
+    );
+$$;
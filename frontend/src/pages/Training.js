@@ -18,11 +18,36 @@ function Training() {
     try {
       const jobs = await getTrainingStatus(token);
       setTrainingJobs(jobs);
+      return jobs;
     } catch (err) {
       console.error('Failed to fetch training status:', err);
+      return [];
     }
   };
 
+  const POLL_INTERVAL_MS = 3000;
+  const MAX_POLLS = 200; // ~10 minutes
+
+  // Training runs as a background job: the start request returns 202 with
+  // a job id, so poll /training/status until that job completes or fails.
+  const waitForJob = async (jobId) => {
+    for (let i = 0; i < MAX_POLLS; i++) {
+      await new Promise((resolve) => setTimeout(resolve, POLL_INTERVAL_MS));
+      const jobs = await fetchTrainingStatus();
+      const job = jobs.find((j) => j.id === jobId);
+      if (job && job.status === 'completed') {
+        setMessage(`Training completed! Trained on ${job.training_data_count ?? 'N/A'} samples.`);
+        return;
+      }
+      if (job && job.status === 'failed') {
+        setMessage('');
+        setError(job.error_message || 'Training failed');
+        return;
+      }
+    }
+    setMessage('Training is still running - check the history below for its status.');
+  };
+
   const handleTrain = async (e) => {
     e.preventDefault();
     setLoading(true);
@@ -31,8 +56,9 @@ function Training() {
 
     try {
       const result = await trainModel(modelType, token);
-      setMessage(`Training completed! Model: ${result.version_name}, R² Score: ${result.results?.r2_score?.toFixed(4) || 'N/A'}`);
+      setMessage(`Training job started (job ${result.job_id}). Waiting for it to finish...`);
       fetchTrainingStatus();
+      await waitForJob(result.job_id);
     } catch (err) {
       setError(err.response?.data?.error || 'Training failed');
     } finally {
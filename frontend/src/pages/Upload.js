@@ -44,7 +44,13 @@ function Upload() {
       const file = files[0];
       validateFile(file);
       const result = await uploadWeatherCSV(file, token);
-      setMessage(`Successfully uploaded ${result.count} weather records from ${result.file_type || 'file'}`);
+      // Synchronous ingestion returns a count; brokered ingestion returns
+      // 202 with a job id and processes in the background.
+      if (result.count !== undefined) {
+        setMessage(`Successfully uploaded ${result.count} weather records from ${result.file_type || 'file'}`);
+      } else {
+        setMessage(result.message || 'Upload accepted - records are being processed in the background');
+      }
     } catch (err) {
       const errorMsg = err.response?.data?.details || err.response?.data?.error || err.message || 'Upload failed';
       setError(errorMsg);
@@ -63,7 +69,13 @@ function Upload() {
       const file = files[0];
       validateFile(file);
       const result = await uploadProductionCSV(file, token);
-      setMessage(`Successfully uploaded ${result.count} production records from ${result.file_type || 'file'}`);
+      // Synchronous ingestion returns a count; brokered ingestion returns
+      // 202 with a job id and processes in the background.
+      if (result.count !== undefined) {
+        setMessage(`Successfully uploaded ${result.count} production records from ${result.file_type || 'file'}`);
+      } else {
+        setMessage(result.message || 'Upload accepted - records are being processed in the background');
+      }
     } catch (err) {
       const errorMsg = err.response?.data?.details || err.response?.data?.error || err.message || 'Upload failed';
       setError(errorMsg);
@@ -5,58 +5,123 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pacsv
+except ImportError:
+    pa = None
+
+# Rows generated and written per batch: peak memory stays O(chunk) no
+# matter how many days are requested, so decade-scale ranges work too
+CHUNK_ROWS = 65536
+
+
+def _to_arrow(df):
+    """Convert a frame to an Arrow table, formatting timestamp columns to
+    ISO at conversion time in C so no object-dtype string column is ever
+    materialized"""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    for i, field in enumerate(table.schema):
+        if pa.types.is_timestamp(field.type):
+            # Cast to second precision first: strftime's %S emits
+            # fractional seconds for ns-precision columns, which would
+            # diverge from the pandas fallback's date_format output
+            column = pc.cast(table.column(i), pa.timestamp('s'))
+            table = table.set_column(
+                i, field.name,
+                pc.strftime(column, format='%Y-%m-%dT%H:%M:%S'))
+    return table
+
+
+def write_csv_chunks(filename, dates, make_frame):
+    """Build the dataset CHUNK_ROWS rows at a time and stream each batch
+    to the CSV writer - pyarrow's multi-threaded C writer when available,
+    appending pandas to_csv otherwise"""
+    writer = None
+    try:
+        for start in range(0, len(dates), CHUNK_ROWS):
+            chunk = make_frame(dates[start:start + CHUNK_ROWS], start)
+            if pa is not None:
+                table = _to_arrow(chunk)
+                if writer is None:
+                    writer = pacsv.CSVWriter(filename, table.schema)
+                writer.write_table(table)
+            else:
+                chunk.to_csv(filename, index=False, mode='w' if start == 0 else 'a',
+                             header=start == 0, date_format='%Y-%m-%dT%H:%M:%S')
+    finally:
+        if writer is not None:
+            writer.close()
+
+
 def generate_weather_data(start_date='2024-01-01', days=365, filename='weather_data.csv'):
     """Generate synthetic weather data"""
     dates = pd.date_range(start=start_date, periods=days*24, freq='H')
-    
-    # Generate realistic weather patterns
-    base_temp = 20
-    temp_variation = 10 * np.sin(np.arange(len(dates)) * 2 * np.pi / (365*24))  # Seasonal variation
-    hourly_variation = 5 * np.sin(np.arange(len(dates)) * 2 * np.pi / 24)  # Daily variation
-    
-    weather_data = pd.DataFrame({
-        'timestamp': dates.strftime('%Y-%m-%dT%H:%M:%S'),
-        'temperature': (base_temp + temp_variation + hourly_variation + np.random.randn(len(dates)) * 3).clip(0, 40),
-        'humidity': (50 + 20 * np.sin(np.arange(len(dates)) * 2 * np.pi / 24) + np.random.randn(len(dates)) * 10).clip(0, 100),
-        'wind_speed': (5 + 3 * np.random.randn(len(dates))).clip(0, 20),
-        'cloud_cover': (30 + 20 * np.sin(np.arange(len(dates)) * 2 * np.pi / 24) + np.random.randn(len(dates)) * 15).clip(0, 100),
-        'solar_irradiance': (500 + 300 * np.sin(np.arange(len(dates)) * 2 * np.pi / 24) + np.random.randn(len(dates)) * 50).clip(0, 1000),
-        'precipitation': np.random.exponential(0.5, len(dates)).clip(0, 50),
-        'is_forecast': False,
-        'location': 'Solar Farm A'
-    })
-    
-    weather_data.to_csv(filename, index=False)
-    print(f"Generated {len(weather_data)} weather records in {filename}")
-    return weather_data
+    rng = np.random.default_rng()
+
+    def make_frame(chunk_dates, offset):
+        n = len(chunk_dates)
+        # The daily and seasonal cycles are shared by several columns, so
+        # compute each sinusoid once per chunk (from the absolute hour
+        # index); all the gaussian noise comes from one generator draw
+        idx = np.arange(offset, offset + n, dtype=np.float32)
+        daily = np.sin(idx * (2 * np.pi / 24))
+        seasonal = np.sin(idx * (2 * np.pi / (365 * 24)))
+        noise = rng.standard_normal((5, n))
+
+        # Generate realistic weather patterns
+        base_temp = 20
+        temp_variation = 10 * seasonal  # Seasonal variation
+        hourly_variation = 5 * daily  # Daily variation
+
+        return pd.DataFrame({
+            'timestamp': chunk_dates,
+            'temperature': (base_temp + temp_variation + hourly_variation + noise[0] * 3).clip(0, 40),
+            'humidity': (50 + 20 * daily + noise[1] * 10).clip(0, 100),
+            'wind_speed': (5 + 3 * noise[2]).clip(0, 20),
+            'cloud_cover': (30 + 20 * daily + noise[3] * 15).clip(0, 100),
+            'solar_irradiance': (500 + 300 * daily + noise[4] * 50).clip(0, 1000),
+            'precipitation': rng.exponential(0.5, n).clip(0, 50),
+            'is_forecast': False,
+            'location': 'Solar Farm A'
+        })
+
+    write_csv_chunks(filename, dates, make_frame)
+    print(f"Generated {len(dates)} weather records in {filename}")
+
 
 def generate_production_data(start_date='2024-01-01', days=365, filename='production_data.csv'):
     """Generate synthetic production data based on weather patterns"""
     dates = pd.date_range(start=start_date, periods=days*24, freq='H')
-    
-    # Generate production based on solar irradiance pattern
-    base_irradiance = 500 + 300 * np.sin(np.arange(len(dates)) * 2 * np.pi / 24)
-    production = (base_irradiance * 0.2 + np.random.randn(len(dates)) * 10).clip(0)
-    
-    production_data = pd.DataFrame({
-        'timestamp': dates.strftime('%Y-%m-%dT%H:%M:%S'),
-        'energy_output_kwh': production,
-        'panel_id': 'panel_001',
-        'system_capacity_kw': 10.0,
-        'efficiency': 20.0
-    })
-    
-    production_data.to_csv(filename, index=False)
-    print(f"Generated {len(production_data)} production records in {filename}")
-    return production_data
+    rng = np.random.default_rng()
+
+    def make_frame(chunk_dates, offset):
+        n = len(chunk_dates)
+        # Generate production based on solar irradiance pattern
+        daily = np.sin(np.arange(offset, offset + n, dtype=np.float32) * (2 * np.pi / 24))
+        base_irradiance = 500 + 300 * daily
+        production = (base_irradiance * 0.2 + rng.standard_normal(n) * 10).clip(0)
+
+        return pd.DataFrame({
+            'timestamp': chunk_dates,
+            'energy_output_kwh': production,
+            'panel_id': 'panel_001',
+            'system_capacity_kw': 10.0,
+            'efficiency': 20.0
+        })
+
+    write_csv_chunks(filename, dates, make_frame)
+    print(f"Generated {len(dates)} production records in {filename}")
+
 
 if __name__ == '__main__':
     print("Generating sample data files...")
     print("=" * 50)
-    
-    weather_df = generate_weather_data()
-    production_df = generate_production_data()
-    
+
+    generate_weather_data()
+    generate_production_data()
+
     print("=" * 50)
     print("Sample data files created!")
     print("\nYou can now upload these files via the Upload page in the web app.")
@@ -64,6 +129,3 @@ if __name__ == '__main__':
     print("  curl -X POST http://localhost:8000/api/upload/weather/ \\")
     print("    -H 'Authorization: Bearer <token>' \\")
     print("    -F 'file=@weather_data.csv'")
-
-
-